@@ -42,7 +42,6 @@ class DSAAgent:
         self.mcp_tools = self._get_mcp_tools()
         logger.info(f"DSA Agent initialized successfully for user {user_id}")
 
-    @time_component()
     def _safe_get_tool_info(self, tool) -> dict | None:
         """Safely extract tool information for serialization"""
         if tool is None:
@@ -178,7 +177,11 @@ class DSAAgent:
                 event_count = 0
                 async for event in response_stream:
                     event_count += 1
-                    logger.info(f"DSA Agent (streaming event #{event_count}): {event}")
+                    # Per-event logs use lazy formatting so the event repr is only
+                    # built when debug logging is enabled
+                    logger.debug(
+                        "DSA Agent (streaming event #%d): %s", event_count, event
+                    )
 
                     # Handle different event types and yield structured content
                     content = None
@@ -314,7 +317,7 @@ class DSAAgent:
                         content = {"event": "unknown", "data": event_data}
 
                     if content:
-                        logger.info(f"Yielding content: {content}")
+                        logger.debug("Yielding content: %s", content)
                         yield content
 
                 logger.info(
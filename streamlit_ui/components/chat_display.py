@@ -3,6 +3,8 @@ Chat display component for Streamlit DSA Agent
 """
 
 import streamlit as st
+from utils.config import EVENT_LOG_TABLE_THRESHOLD
+from utils.markdown import render_step_markdown
 
 
 def display_chat_messages():
@@ -10,9 +12,14 @@ def display_chat_messages():
     for message in st.session_state.messages:
         with st.chat_message(message["role"]):
             if message["role"] == "assistant":
-                # Show event log if available
-                if "execution_status" in message and "event_log" in message["execution_status"]:
-                    _display_event_log(message["execution_status"]["event_log"])
+                # Show event log if available; empty statuses and logs skip the
+                # expander entirely
+                execution_status = message.get("execution_status")
+                if execution_status and execution_status.get("event_log"):
+                    _display_event_log(
+                        execution_status["event_log"],
+                        execution_status.get("collapsed_steps", 0),
+                    )
 
                 # Show message content
                 st.markdown(message["content"])
@@ -21,15 +28,48 @@ def display_chat_messages():
                 st.markdown(message["content"])
 
 
-def _display_event_log(event_steps: list):
+def _display_event_log(event_steps: list, collapsed_steps: int = 0):
     """Display event log steps"""
     with st.expander("🔄 Processing Steps", expanded=False):
-        for step in event_steps:
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.write(f"**{step['title']}**")
-                if step.get("details"):
-                    st.caption(step["details"])
-            with col2:
-                if step.get("duration") and step["completed"]:
-                    st.caption(f"{step['duration']:.2f}s")
+        if collapsed_steps:
+            st.caption(f"… {collapsed_steps} earlier steps collapsed")
+
+        # Long logs collapse into one table element instead of a row per step
+        if len(event_steps) > EVENT_LOG_TABLE_THRESHOLD:
+            _display_event_table(event_steps)
+            return
+
+        st.markdown(_render_event_log_markdown(event_steps))
+
+
+# Logs of past messages never change after streaming, so their rendering is
+# cached and each rerun emits one element per log instead of one per step
+@st.cache_data(max_entries=256, show_spinner=False)
+def _render_event_log_markdown(event_steps: list) -> str:
+    """Render a finished event log into a single markdown block"""
+    return "\n\n".join(
+        render_step_markdown(
+            step["title"],
+            step.get("details"),
+            # Steps still running have no meaningful duration yet
+            step.get("duration") if step["completed"] else None,
+        )
+        for step in event_steps
+    )
+
+
+def _display_event_table(event_steps: list):
+    """Display event log steps as a single dataframe"""
+    rows = [
+        {
+            "": "✅" if step["completed"] else "🔄",
+            "Step": step["title"],
+            "Details": step.get("details") or "",
+            # Steps still running have no meaningful duration yet
+            "Duration": (
+                f"{step.get('duration') or 0:.2f}s" if step["completed"] else ""
+            ),
+        }
+        for step in event_steps
+    ]
+    st.dataframe(rows, hide_index=True, use_container_width=True)
@@ -7,7 +7,7 @@ from typing import Any, Dict
 import streamlit as st
 from utils.config import (
     DEFAULT_DEBUG_MODE,
-    DEFAULT_MODEL,
+    DEFAULT_MODEL_INDEX,
     DEFAULT_SHOW_EVENTS,
     MODEL_OPTIONS,
     USAGE_INSTRUCTIONS,
@@ -28,7 +28,7 @@ def setup_sidebar() -> Dict[str, Any]:
     selected_model = st.sidebar.selectbox(
         "Select Model",
         MODEL_OPTIONS,
-        index=MODEL_OPTIONS.index(DEFAULT_MODEL),
+        index=DEFAULT_MODEL_INDEX,
         help="Choose the AI model to use for the agent",
     )
 
@@ -2,7 +2,7 @@
 Core application class for Streamlit DSA Agent
 """
 
-import asyncio
+import hashlib
 from typing import Any, Dict
 
 import streamlit as st
@@ -17,7 +17,7 @@ from utils.config import (
     PAGE_TITLE,
     SIDEBAR_STATE,
 )
-from utils.session import initialize_session_state
+from utils.session import add_assistant_message, initialize_session_state
 
 from dsa_agent.agent import DSAAgent
 
@@ -28,6 +28,7 @@ class StreamlitDSAAgent:
     def __init__(self):
         self.response_streamer = ResponseStreamer()
         initialize_session_state()
+        self._loop = st.session_state.event_loop
 
     def get_agent(self, config: Dict[str, Any]) -> DSAAgent:
         """Get or create DSA Agent instance"""
@@ -38,10 +39,14 @@ class StreamlitDSAAgent:
         lc_session = config["lc_session"]
         gh_token = config["gh_token"]
 
-        # Create a unique key for the agent configuration
-        agent_key = (
-            f"{model}_{debug_mode}_{lc_site}_{bool(lc_session)}_{bool(gh_token)}"
-        )
+        # Create a unique key for the agent configuration; credentials are part
+        # of the digest so rotating a token rebuilds the agent
+        agent_key = hashlib.blake2b(
+            repr(
+                (model, debug_mode, lc_site, lc_session, gh_token, gemini_api_key)
+            ).encode(),
+            digest_size=8,
+        ).hexdigest()
 
         if (
             st.session_state.agent is None
@@ -123,17 +128,11 @@ class StreamlitDSAAgent:
             agent = self.get_agent(config)
 
             # Stream the response
-            full_response, execution_status = asyncio.run(
+            full_response, execution_status = self._loop.run_until_complete(
                 self.response_streamer.stream_response(
                     agent, user_message, config["show_events"]
                 )
             )
 
             # Add assistant response to session state with execution status
-            st.session_state.messages.append(
-                {
-                    "role": "assistant",
-                    "content": full_response,
-                    "execution_status": execution_status,
-                }
-            )
+            add_assistant_message(full_response, execution_status)
@@ -1,103 +1,496 @@
+import asyncio
 import time
+from collections import deque
 from typing import Any, Dict, Tuple
-import html
+import json
+import re
 import streamlit as st
+from utils.markdown import escape_markdown, render_step_markdown
+
+# Paragraph breaks outside of code fences and $$ math blocks; an unclosed fence
+# or math block swallows the rest of the text so blank lines inside it are never
+# treated as block boundaries. A break only counts once the next line has begun
+# unindented, so list continuations and indented code stay in one block
+_BLOCK_BOUNDARY_RE = re.compile(
+    r"(?P<fence>```|~~~).*?(?:(?P=fence)|\Z)"
+    r"|\$\$.*?(?:\$\$|\Z)"
+    r"|(?P<boundary>\n\n+)(?=\S)(?!~~~)",
+    re.S,
+)
+
+# Events that only extend the response text and never change the step log
+_CONTENT_EVENT_TYPES = frozenset({"content", "unknown"})
+
+# Each event in the debug dump is truncated to this many characters
+_EVENT_PREVIEW_CHARS = 2000
+# At most this many of the latest events are kept for the debug dump
+_MAX_DEBUG_EVENTS = 200
+
+# A burst of this many step events is rendered without waiting for the timer
+_RENDER_BATCH_STEPS = 8
+
+# Only the most recent steps are kept; older ones collapse into a count
+_MAX_EVENT_STEPS = 200
+
+# Step details longer than this are cut short in the event log
+_DETAILS_MAX_CHARS = 500
+
+def _truncate_details(details: str) -> str:
+    """Cut details down to _DETAILS_MAX_CHARS for display"""
+    if len(details) <= _DETAILS_MAX_CHARS:
+        return details
+    return details[:_DETAILS_MAX_CHARS] + "…"
+
+
+_STREAM_END = object()
+
+
+async def _buffered(aiter, size: int = 8, yield_every: int = 16):
+    """Iterate aiter while a background task prefetches up to size items"""
+    queue = asyncio.Queue(maxsize=size)
+    error = None
+    stopped = False
+
+    async def produce():
+        nonlocal error
+        try:
+            async for item in aiter:
+                await queue.put(item)
+        # Cancellation and Streamlit stop requests are BaseExceptions; they are
+        # handed to the consumer too, or it would wait for the end forever
+        except BaseException as e:
+            error = e
+        finally:
+            try:
+                if hasattr(aiter, "aclose"):
+                    await aiter.aclose()
+            finally:
+                # Nobody reads the queue once the consumer has stopped
+                if not stopped:
+                    await queue.put(_STREAM_END)
+
+    producer = asyncio.create_task(produce())
+    ready = 0
+    try:
+        while True:
+            # get() only suspends on an empty queue; after a run of items that
+            # were already waiting, yield so the render timer and producer run
+            if queue.empty():
+                ready = 0
+            else:
+                ready += 1
+                if ready % yield_every == 0:
+                    await asyncio.sleep(0)
+            item = await queue.get()
+            if item is _STREAM_END:
+                break
+            yield item
+        if error is not None:
+            raise error
+    finally:
+        stopped = True
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
 
 
 class ResponseStreamer:
     """Handles streaming of agent responses with event tracking"""
 
-    def __init__(self):
+    # Handlers read instance state on every event; slots keep lookups cheap
+    __slots__ = (
+        "start_time",
+        "event_steps",
+        "active_tools",
+        "current_tool",
+        "event_log",
+        "message_placeholder",
+        "reasoning_steps",
+        "_total_events",
+        "_tools_used",
+        "_execution_time",
+        "_max_steps",
+        "_response_parts",
+        "_response_str",
+        "_delta_queue",
+        "_status",
+        "_collapsed_slot",
+        "_stable_container",
+        "_trailing_placeholder",
+        "_stable_len",
+        "_render_interval",
+        "_render_pending",
+        "_render_error",
+        "_run_failed",
+        "_rendered_len",
+        "_content_final",
+        "_batch_started",
+        "_pending_steps",
+        "_step_by_id",
+        "_next_step_id",
+        "_collapsed_steps",
+        "_collapsed_shown",
+        "_step_slots",
+        "_dirty",
+        "_open_reasoning_id",
+        "_open_tool_id",
+        "_open_memory_id",
+        "_open_paused_id",
+        "_handlers",
+    )
+
+    # Event type -> handler method name, resolved to bound methods per instance
+    _HANDLER_NAMES = {
+        "run_started": "_handle_run_started",
+        "content": "_handle_content",
+        "run_completed": "_handle_run_completed",
+        "run_error": "_handle_run_error",
+        "run_cancelled": "_handle_run_cancelled",
+        "run_paused": "_handle_run_paused",
+        "run_continued": "_handle_run_continued",
+        "reasoning_started": "_handle_reasoning_started",
+        "reasoning_step": "_handle_reasoning_step",
+        "reasoning_completed": "_handle_reasoning_completed",
+        "tool_call_started": "_handle_tool_call_started",
+        "tool_call_completed": "_handle_tool_call_completed",
+        "memory_update_started": "_handle_memory_update_started",
+        "memory_update_completed": "_handle_memory_update_completed",
+        "unknown": "_handle_unknown_event",
+    }
+
+    def __init__(
+        self, render_interval_s: float = 0.05, max_steps: int = _MAX_EVENT_STEPS
+    ):
         self.start_time = None
-        self.event_steps = []
+        # Only the latest max_steps steps are kept and shown
+        self._max_steps = max_steps
+        self.event_steps = deque(maxlen=max_steps)
         self.full_response = ""
+        # Set only while an iter_deltas() consumer is attached
+        self._delta_queue = None
         self.active_tools = []
         self.current_tool = None
         self.event_log = None
+        self._status = None
+        self._collapsed_slot = None
         self.message_placeholder = None
+        self._stable_container = None
+        self._trailing_placeholder = None
+        self._stable_len = 0
         self.reasoning_steps = 0
+        # Run counters, reported in the execution status once streaming ends
+        self._total_events = 0
+        self._tools_used = []
+        self._execution_time = 0.0
+        # Deltas and step changes within this many seconds share a single render
+        self._render_interval = render_interval_s
+        self._render_pending = None
+        self._render_error = None
+        self._run_failed = False
+        self._rendered_len = 0
+        self._content_final = False
+        self._batch_started = 0.0
+        self._pending_steps = 0
+        # Steps by id; ids stay valid while older steps are evicted
+        self._step_by_id = {}
+        self._next_step_id = 0
+        self._collapsed_steps = 0
+        self._collapsed_shown = 0
+        # One placeholder per step id; only ids marked dirty are re-rendered
+        self._step_slots = {}
+        self._dirty = set()
+        # Ids of steps still waiting for their completion event
+        self._open_reasoning_id = None
+        self._open_tool_id = {}
+        self._open_memory_id = None
+        self._open_paused_id = None
+        self._handlers = {
+            event_type: getattr(self, name)
+            for event_type, name in self._HANDLER_NAMES.items()
+        }
+
+    @property
+    def full_response(self) -> str:
+        """Streamed response text, joined from its parts only when read"""
+        if self._response_str is None:
+            self._response_str = "".join(self._response_parts)
+            # Keep the joined text as the single part so the list stays short
+            self._response_parts = [self._response_str]
+        return self._response_str
+
+    @full_response.setter
+    def full_response(self, value: str):
+        self._response_parts = [value]
+        self._response_str = value
+
+    def _append_response(self, content: str):
+        """Append a streamed delta without re-copying the accumulated text"""
+        self._response_parts.append(content)
+        self._response_str = None
+        if self._delta_queue is not None:
+            self._delta_queue.put_nowait(content)
 
     async def stream_response(
-        self, agent, user_message: str, show_events: bool = False
+        self,
+        agent,
+        user_message: str,
+        show_events: bool = False,
+        event_log_slot=None,
+        message_slot=None,
     ) -> Tuple[str, Dict[str, Any]]:
-        """Stream agent response and update UI with detailed event handling"""
-        self.start_time = time.time()
+        """Stream agent response and update UI with detailed event handling
+
+        event_log_slot and message_slot are optional st.empty() placeholders
+        to render into; new ones are created in the chat message otherwise.
+        """
+        self.start_time = time.monotonic()
         self._initialize_execution_tracking()
 
         with st.chat_message("assistant"):
-            self._setup_ui_containers()
+            self._setup_ui_containers(event_log_slot, message_slot)
 
             try:
                 await self._process_stream(agent, user_message, show_events)
                 self._finalize_execution()
             except Exception as e:
                 self._handle_stream_error(e)
-
-            return self.full_response, {"event_log": self.event_steps}
+            finally:
+                self._end_deltas()
+                # The session loop outlives this run; a leftover timer would
+                # render into this run's placeholders during the next one
+                await self._stop_pending_render()
+            self._raise_render_error()
+
+            return self.full_response, self._execution_status()
+
+    def iter_deltas(self):
+        """Return an async iterator over response deltas as they are streamed
+
+        Call it before or while stream_response runs; iteration ends when the
+        response is complete, or raises the error if the run failed.
+        """
+        self._delta_queue = asyncio.Queue()
+        return self._drain_deltas(self._delta_queue)
+
+    @staticmethod
+    async def _drain_deltas(queue: asyncio.Queue):
+        while (delta := await queue.get()) is not None:
+            if isinstance(delta, BaseException):
+                raise delta
+            yield delta
+
+    def _end_deltas(self):
+        if self._delta_queue is not None:
+            self._delta_queue.put_nowait(None)
+            self._delta_queue = None
+
+    def _fail_deltas(self, error: BaseException):
+        """End the delta iterator with error instead of a normal completion"""
+        if self._delta_queue is not None:
+            self._delta_queue.put_nowait(error)
+            self._delta_queue = None
+
+    def _execution_status(self) -> Dict[str, Any]:
+        """Build the execution status stored with the assistant message"""
+        return {
+            "event_log": list(self.event_steps),
+            "collapsed_steps": self._collapsed_steps,
+            "tools_used": self._tools_used,
+            "details": {
+                "total_events": self._total_events,
+                "execution_time": self._execution_time,
+                "reasoning_steps": self.reasoning_steps,
+            },
+        }
 
     def _initialize_execution_tracking(self):
         """Initialize execution status tracking"""
-        self.event_steps = []
+        self.event_steps = deque(maxlen=self._max_steps)
         self.full_response = ""
         self.active_tools = []
         self.current_tool = None
         self.reasoning_steps = 0
-
-    def _setup_ui_containers(self):
+        self._total_events = 0
+        self._tools_used = []
+        self._execution_time = 0.0
+        self._render_pending = None
+        self._render_error = None
+        self._run_failed = False
+        self._rendered_len = 0
+        self._content_final = False
+        self._batch_started = 0.0
+        self._pending_steps = 0
+        self._stable_len = 0
+        self._step_by_id = {}
+        self._next_step_id = 0
+        self._collapsed_steps = 0
+        self._collapsed_shown = 0
+        self._step_slots = {}
+        self._dirty = set()
+        self._open_reasoning_id = None
+        self._open_tool_id = {}
+        self._open_memory_id = None
+        self._open_paused_id = None
+
+    def _setup_ui_containers(self, event_log_slot=None, message_slot=None):
         """Setup UI containers for event log and content"""
-        event_log_container = st.container()
-        content_container = st.container()
-
-        with event_log_container:
-            st.markdown("**🔄 Processing Steps:**")
-            self.event_log = st.empty()
-
-        with content_container:
-            self.message_placeholder = st.empty()
+        if event_log_slot is None:
+            with st.container():
+                event_log_slot = st.empty()
+
+        if message_slot is None:
+            with st.container():
+                message_slot = st.empty()
+
+        self.event_log = event_log_slot
+        self.message_placeholder = message_slot
+        # st.status tracks running/complete state itself
+        self._status = self.event_log.status("🔄 Processing Steps", expanded=True)
+        self._collapsed_slot = self._status.empty()
+        self._step_slots = {}
+
+        # Completed blocks are rendered once into the stable container; only the
+        # trailing, still-growing block is re-rendered on each update
+        body = self.message_placeholder.container()
+        self._stable_container = body.container()
+        self._trailing_placeholder = body.empty()
+        # The cursor gets its own slot so content renders never carry it; it is
+        # removed when the final response replaces the body
+        body.empty().markdown("▌")
 
     async def _process_stream(self, agent, user_message: str, show_events: bool):
         """Process the event stream from the agent"""
-        async for event_data in agent.astream_agent(user_message):
+        # The next events are fetched while the current one is being rendered
+        events = _buffered(agent.astream_agent(user_message))
+        if show_events:
+            process = self._process_stream_debug
+        else:
+            process = self._process_stream_fast
+        try:
+            await process(events)
+        finally:
+            # Stops the prefetching task if rendering fails part-way
+            await events.aclose()
+
+    async def _process_stream_fast(self, events):
+        """Handle each event from the buffered agent stream"""
+        async for event_data in events:
+            if self._render_error is not None:
+                self._raise_render_error()
             if not event_data:
                 continue
+            self._total_events += 1
 
             event_type = event_data.get("event", "unknown")
-            data = event_data.get("data", {})
-            current_time = time.time()
-
-            if show_events:
-                with st.expander(f"🐛 Event: {event_type}", expanded=False):
-                    st.json(data)
+            # Content arrives once per token, so it skips timing and dispatch
+            if event_type == "content":
+                self._fast_content(event_data.get("data", {}))
+                continue
 
-            await self._handle_event(event_type, data, current_time)
+            self._handle_event(event_type, event_data.get("data", {}), time.monotonic())
+
+    async def _process_stream_debug(self, events):
+        """Handle events like _process_stream_fast, recording them for a dump"""
+        # Serialized and rendered once, after the stream, in a single expander
+        raw_events = deque(maxlen=_MAX_DEBUG_EVENTS)
+        total = 0
+        try:
+            async for event_data in events:
+                if self._render_error is not None:
+                    self._raise_render_error()
+                if not event_data:
+                    continue
+                self._total_events += 1
+
+                event_type = event_data.get("event", "unknown")
+                data = event_data.get("data", {})
+                raw_events.append((event_type, data))
+                total += 1
+                if event_type == "content":
+                    self._fast_content(data)
+                    continue
+
+                self._handle_event(event_type, data, time.monotonic())
+        finally:
+            self._render_debug_events(raw_events, total)
+
+    def _render_debug_events(self, raw_events: deque, total: int):
+        """Dump recorded events as JSON lines in one expander"""
+        if not total:
+            return
+        with st.expander(f"🐛 Events ({total})", expanded=False):
+            if total > len(raw_events):
+                st.caption(f"Only the last {len(raw_events)} events are shown")
+            st.code(
+                "\n".join(
+                    json.dumps({"event": event_type, "data": data}, default=str)[
+                        :_EVENT_PREVIEW_CHARS
+                    ]
+                    for event_type, data in raw_events
+                ),
+                language="json",
+            )
 
-    async def _handle_event(self, event_type: str, data: dict, current_time: float):
+    def _handle_event(self, event_type: str, data: dict, current_time: float):
         """Handle individual event based on type"""
-        event_handlers = {
-            "run_started": self._handle_run_started,
-            "content": self._handle_content,
-            "run_completed": self._handle_run_completed,
-            "run_error": self._handle_run_error,
-            "run_cancelled": self._handle_run_cancelled,
-            "run_paused": self._handle_run_paused,
-            "run_continued": self._handle_run_continued,
-            "reasoning_started": self._handle_reasoning_started,
-            "reasoning_step": self._handle_reasoning_step,
-            "reasoning_completed": self._handle_reasoning_completed,
-            "tool_call_started": self._handle_tool_call_started,
-            "tool_call_completed": self._handle_tool_call_completed,
-            "memory_update_started": self._handle_memory_update_started,
-            "memory_update_completed": self._handle_memory_update_completed,
-            "unknown": self._handle_unknown_event,
-        }
-
-        handler = event_handlers.get(event_type, self._handle_unknown_event)
+        handler = self._handlers.get(event_type, self._handle_unknown_event)
         handler(data, current_time)
-        self._update_event_log()
+        if event_type not in _CONTENT_EVENT_TYPES:
+            self._pending_steps += 1
+            # Events already prefetched are handled without yielding to the
+            # timer, so a batch that has outlived the interval renders right away
+            if self._pending_steps >= _RENDER_BATCH_STEPS or (
+                self._render_pending is not None
+                and current_time - self._batch_started >= self._render_interval
+            ):
+                self._render_now()
+            else:
+                self._schedule_render()
+
+    def _append_step(self, step: dict) -> int:
+        """Add a step to the event log, mark it for rendering and return its id"""
+        if len(self.event_steps) == self.event_steps.maxlen:
+            self._evict_step(self.event_steps[0]["id"])
+        step_id = self._next_step_id
+        self._next_step_id += 1
+        step["id"] = step_id
+        self.event_steps.append(step)
+        self._step_by_id[step_id] = step
+        self._dirty.add(step_id)
+        return step_id
+
+    def _evict_step(self, step_id: int):
+        """Forget the oldest step before the ring buffer drops it"""
+        del self._step_by_id[step_id]
+        self._dirty.discard(step_id)
+        slot = self._step_slots.pop(step_id, None)
+        if slot is not None:
+            slot.empty()
+        self._collapsed_steps += 1
+
+    def _complete_step(self, step_id: int | None, step: dict, current_time: float):
+        """Complete the open step in place, or append step if it is gone"""
+        open_step = self._step_by_id.get(step_id)
+        if open_step is None:
+            self._append_step(step)
+            return
+
+        open_step["title"] = step["title"]
+        self._close_step(step_id, current_time, step["details"])
+
+    def _close_step(self, step_id: int, now: float, details: str | None = None):
+        """Mark the step completed, timing it from its start"""
+        step = self._step_by_id.get(step_id)
+        if step is None:
+            return
+        step["completed"] = True
+        step["duration"] = now - step["start_time"]
+        if details is not None:
+            step["details"] = details
+        self._dirty.add(step_id)
 
     def _handle_run_started(self, data: dict, current_time: float):
-        model_name = data.get("model", "Unknown Model")
-        self.event_steps.append(
+        model_name = escape_markdown(str(data.get("model", "Unknown Model")))
+        self._append_step(
             {
                 "title": f"🚀 Starting execution with {model_name}",
                 "details": "Initializing agent and tools",
@@ -108,25 +501,33 @@ class ResponseStreamer:
         )
 
     def _handle_content(self, data: dict, current_time: float):
+        self._fast_content(data)
+
+    def _fast_content(self, data: dict):
+        """Append a content delta and schedule the coalesced render"""
         content = data.get("content", "")
         if content and isinstance(content, str):
-            self.full_response += content
-            self.message_placeholder.markdown(self.full_response + "▌")
+            self._append_response(content)
+            # Whitespace-only deltas change nothing visible; they are shown
+            # with the next delta that does
+            if not content.isspace():
+                self._flush_content()
 
     def _handle_run_completed(self, data: dict, current_time: float):
-        self.event_steps.append(
+        self._append_step(
             {
                 "title": "✅ Execution completed successfully",
                 "details": "Response generation finished",
                 "completed": True,
                 "start_time": current_time,
-                "duration": time.time() - self.start_time,
+                "duration": current_time - self.start_time,
             }
         )
+        self._flush_content(force=True)
 
     def _handle_run_error(self, data: dict, current_time: float):
         error_msg = data.get("error_message", "Unknown error")
-        self.event_steps.append(
+        self._append_step(
             {
                 "title": "❌ Error occurred",
                 "details": error_msg,
@@ -136,10 +537,13 @@ class ResponseStreamer:
             }
         )
         self.full_response = f"**Error**: {error_msg}"
+        self._flush_content(force=True)
+        self._run_failed = True
+        self._fail_deltas(RuntimeError(error_msg))
 
     def _handle_run_cancelled(self, data: dict, current_time: float):
         reason = data.get("reason", "No reason provided")
-        self.event_steps.append(
+        self._append_step(
             {
                 "title": "⏹️ Execution cancelled",
                 "details": reason,
@@ -151,7 +555,7 @@ class ResponseStreamer:
 
     def _handle_run_paused(self, data: dict, current_time: float):
         tools = data.get("tools", [])
-        self.event_steps.append(
+        self._open_paused_id = self._append_step(
             {
                 "title": "⏸️ Execution paused",
                 "details": f"{len(tools)} tools need confirmation",
@@ -162,7 +566,10 @@ class ResponseStreamer:
         )
 
     def _handle_run_continued(self, data: dict, current_time: float):
-        self.event_steps.append(
+        if self._open_paused_id is not None:
+            self._close_step(self._open_paused_id, current_time)
+            self._open_paused_id = None
+        self._append_step(
             {
                 "title": "▶️ Execution resumed",
                 "details": "Continuing with approved actions",
@@ -174,7 +581,7 @@ class ResponseStreamer:
 
     def _handle_reasoning_started(self, data: dict, current_time: float):
         self.reasoning_steps = 0
-        self.event_steps.append(
+        self._open_reasoning_id = self._append_step(
             {
                 "title": "🧠 Starting reasoning process",
                 "details": "Analyzing and planning response",
@@ -186,26 +593,39 @@ class ResponseStreamer:
 
     def _handle_reasoning_step(self, data: dict, current_time: float):
         self.reasoning_steps += 1
-        self.event_steps.append(
-            {
-                "title": f"🧠 Reasoning step {self.reasoning_steps}",
-                "details": "Processing logical connections",
-                "completed": False,
-                "start_time": current_time,
-                "duration": 0,
-            }
-        )
+        title = f"🧠 Reasoning step {self.reasoning_steps}"
+        step = self._step_by_id.get(self._open_reasoning_id)
+        if step is None:
+            # No open reasoning row to update, e.g. the start event was evicted
+            self._open_reasoning_id = self._append_step(
+                {
+                    "title": title,
+                    "details": "Processing logical connections",
+                    "completed": False,
+                    "start_time": current_time,
+                    "duration": 0,
+                }
+            )
+            return
+
+        # Steps update the open reasoning row in place instead of adding rows
+        step["title"] = title
+        step["details"] = "Processing logical connections"
+        self._dirty.add(self._open_reasoning_id)
 
     def _handle_reasoning_completed(self, data: dict, current_time: float):
-        self.event_steps.append(
+        self._complete_step(
+            self._open_reasoning_id,
             {
                 "title": "🧠 Reasoning completed",
                 "details": f"Completed {self.reasoning_steps} reasoning steps",
                 "completed": True,
                 "start_time": current_time,
                 "duration": 0,
-            }
+            },
+            current_time,
         )
+        self._open_reasoning_id = None
 
     def _handle_tool_call_started(self, data: dict, current_time: float):
         tool = data.get("tool")
@@ -214,9 +634,11 @@ class ResponseStreamer:
             tool_args = tool.get("args", "No Args")
             self.current_tool = {"name": tool_name, "args": tool_args}
             self.active_tools.append(tool_name)
-            self.event_steps.append(
+            self._tools_used.append(tool_name)
+            label = escape_markdown(str(tool_name))
+            self._open_tool_id[tool_name] = self._append_step(
                 {
-                    "title": f"🔧 Using tool: {tool_name}",
+                    "title": f"🔧 Using tool: {label}",
                     "details": f"Executing with args: {tool_args}",
                     "completed": False,
                     "start_time": current_time,
@@ -233,19 +655,24 @@ class ResponseStreamer:
             if tool_name in self.active_tools:
                 self.active_tools.remove(tool_name)
 
-            self.event_steps.append(
+            label = escape_markdown(str(tool_name))
+            # The result can be arbitrarily large; only a prefix is rendered
+            details = f"Tool execution completed successfully with args: {tool_args} and result: {result}"
+            self._complete_step(
+                self._open_tool_id.pop(tool_name, None),
                 {
-                    "title": f"🔧 Tool: {tool_name} completed",
-                    "details": f"Tool execution completed successfully with args: {tool_args} and result: {result}",
+                    "title": f"🔧 Tool: {label} completed",
+                    "details": _truncate_details(details),
                     "completed": True,
                     "start_time": current_time,
                     "duration": 0,
-                }
+                },
+                current_time,
             )
             self.current_tool = None
 
     def _handle_memory_update_started(self, data: dict, current_time: float):
-        self.event_steps.append(
+        self._open_memory_id = self._append_step(
             {
                 "title": "💾 Updating memory",
                 "details": "Storing conversation context",
@@ -256,69 +683,157 @@ class ResponseStreamer:
         )
 
     def _handle_memory_update_completed(self, data: dict, current_time: float):
-        self.event_steps.append(
+        self._complete_step(
+            self._open_memory_id,
             {
                 "title": "💾 Memory updated",
                 "details": "Memory updated successfully",
                 "completed": True,
                 "start_time": current_time,
                 "duration": 0,
-            }
+            },
+            current_time,
         )
+        self._open_memory_id = None
 
     def _handle_unknown_event(self, data: dict, current_time: float):
         raw_content = data.get("raw_content")
         if raw_content and isinstance(raw_content, str):
-            self.full_response += raw_content
-            self.message_placeholder.markdown(self.full_response + "▌")
+            self._append_response(raw_content)
+            self._flush_content()
 
-    def _update_event_log(self):
-        if not self.event_steps:
+    def _flush_content(self, force: bool = False):
+        """Render the response on the coalesced timer, or right away if forced"""
+        if not force:
+            self._schedule_render()
             return
+        # Final flush so tokens held back by the render throttle are shown; this
+        # replaces the stable/trailing blocks with the complete response
+        self._cancel_pending_render()
+        self._content_final = True
+        self.message_placeholder.markdown(self.full_response)
+
+    def _schedule_render(self):
+        """Schedule a deferred render unless one is already pending"""
+        if self._render_pending is None or self._render_pending.done():
+            self._render_pending = asyncio.create_task(self._render_after_delay())
+            self._batch_started = time.monotonic()
+
+    def _cancel_pending_render(self):
+        if self._render_pending is not None:
+            self._render_pending.cancel()
+            self._render_pending = None
+
+    async def _stop_pending_render(self):
+        """Cancel the render timer and wait until it has stopped"""
+        task = self._render_pending
+        self._cancel_pending_render()
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _render_after_delay(self):
+        # Runs while the stream is waiting on the agent, so deltas that arrive
+        # in the meantime are picked up by this single render
+        await asyncio.sleep(self._render_interval)
+        self._render_pending = None
+        try:
+            self._render_now()
+        except BaseException as e:
+            # Streamlit raises rerun/stop requests from element calls; a task
+            # would swallow them, so the consumer re-raises them instead
+            self._render_error = e
+
+    def _raise_render_error(self):
+        """Re-raise an exception stored by a background render"""
+        error, self._render_error = self._render_error, None
+        if error is not None:
+            raise error
+
+    def _render_now(self):
+        """Render the response tail and dirty log rows, ending the current batch"""
+        self._cancel_pending_render()
+        self._pending_steps = 0
+        self._render_content()
+        self._update_event_log()
 
-        log_html = "<div style='background-color: #f0f2f6; padding: 10px; border-radius: 5px; margin: 10px 0; color: #262730;'>"
-        for step in self.event_steps:
-            title = html.escape(step["title"])
-            log_html += f"<div style='padding: 2px 0; color: #262730;'> <strong style='color: #262730;'>{title}</strong>"
-            if step.get("details"):
-                details = html.escape(step["details"])
-                log_html += f" - <span style='color: #6c757d;'>{details}</span>"
-            if step.get("duration") is not None:
-                log_html += (
-                    f" <em style='color: #28a745;'>({step['duration']:.2f}s)</em>"
-                )
-            log_html += "</div>"
-        log_html += "</div>"
-
-        # Optional: debug output
-        # print(log_html.encode("unicode_escape").decode())
-
-        self.event_log.markdown(log_html, unsafe_allow_html=True)
+    def _render_content(self):
+        """Re-render the trailing block of the streamed response"""
+        # The stable/trailing blocks are gone once the final flush replaced them
+        if self._content_final or len(self.full_response) == self._rendered_len:
+            return
+        self._rendered_len = len(self.full_response)
+        self._commit_stable_blocks()
+        self._trailing_placeholder.markdown(self.full_response[self._stable_len :])
+
+    def _commit_stable_blocks(self):
+        """Render newly completed blocks once and advance the stable offset"""
+        tail = self.full_response[self._stable_len :]
+        boundary = 0
+        for match in _BLOCK_BOUNDARY_RE.finditer(tail):
+            if match.group("boundary"):
+                boundary = match.end()
+
+        if boundary:
+            self._stable_container.markdown(tail[:boundary])
+            self._stable_len += boundary
+
+    def _update_event_log(self):
+        """Render the collapsed-steps count and every dirty step row"""
+        if self._collapsed_steps != self._collapsed_shown:
+            self._collapsed_slot.markdown(
+                f"*… {self._collapsed_steps} earlier steps collapsed*"
+            )
+            self._collapsed_shown = self._collapsed_steps
+
+        slots = self._step_slots
+        # Ids increase with each step, so new slots are created in log order
+        for step_id in sorted(self._dirty):
+            slot = slots.get(step_id)
+            if slot is None:
+                slot = slots[step_id] = self._status.empty()
+            step = self._step_by_id[step_id]
+            # Steps still running have no meaningful duration yet
+            duration = step.get("duration") if step["completed"] else None
+            slot.markdown(
+                render_step_markdown(step["title"], step.get("details"), duration)
+            )
+        self._dirty.clear()
 
     def _finalize_execution(self):
-        execution_time = time.time() - self.start_time
-        self.event_steps.append(
+        self._flush_content(force=True)
+
+        now = time.monotonic()
+        self._execution_time = execution_time = now - self.start_time
+        self._append_step(
             {
                 "title": "🎉 All processing completed",
                 "details": f"Total execution time: {execution_time:.2f}s",
                 "completed": True,
-                "start_time": time.time(),
+                "start_time": now,
                 "duration": 0,
             }
         )
         self._update_event_log()
+        # A run_error event still lets the stream end normally
+        if self._run_failed:
+            self._status.update(label="❌ Failed", state="error")
+        else:
+            self._status.update(label="✅ Done", state="complete")
 
     def _handle_stream_error(self, error: Exception):
-        error_msg = f"**Streaming Error**: {str(error)}"
-        self.message_placeholder.markdown(error_msg)
-        self.event_steps.append(
+        now = time.monotonic()
+        self._execution_time = now - self.start_time
+        self.full_response = f"**Streaming Error**: {str(error)}"
+        self._flush_content(force=True)
+        self._fail_deltas(error)
+        self._append_step(
             {
                 "title": "❌ Processing failed",
                 "details": str(error),
                 "completed": True,
-                "start_time": time.time(),
+                "start_time": now,
                 "duration": 0,
             }
         )
-        self.full_response = error_msg
         self._update_event_log()
+        self._status.update(label="❌ Failed", state="error")
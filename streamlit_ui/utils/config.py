@@ -5,6 +5,7 @@ Configuration settings for the Streamlit DSA Agent
 # Model options
 MODEL_OPTIONS = ["gemini-2.5-flash", "gemini-2.5-pro"]
 DEFAULT_MODEL = "gemini-2.5-flash"
+DEFAULT_MODEL_INDEX = MODEL_OPTIONS.index(DEFAULT_MODEL)
 
 # UI Configuration
 PAGE_TITLE = "DSA Notes Agent"
@@ -16,6 +17,9 @@ SIDEBAR_STATE = "expanded"
 DEFAULT_DEBUG_MODE = True
 DEFAULT_SHOW_EVENTS = False
 
+# Event logs with more steps than this are rendered as a single table
+EVENT_LOG_TABLE_THRESHOLD = 10
+
 # Chat Configuration
 CHAT_INPUT_PLACEHOLDER = "Tell me about a problem you solved or need help with..."
 
@@ -0,0 +1,49 @@
+"""
+Markdown helpers for the Streamlit DSA Agent
+"""
+
+# Step details and agent-supplied names carry arbitrary text; markdown and LaTeX
+# markers in them are escaped and line breaks flattened so rows stay on one line
+_INLINE_ESCAPE_TABLE = str.maketrans(
+    {
+        **{c: "\\" + c for c in "\\`*_[]#|~<>$"},
+        "\n": " ",
+        "\r": "",
+    }
+)
+
+
+def escape_markdown(text: str) -> str:
+    """Escape dynamic text for inline markdown"""
+    return text.translate(_INLINE_ESCAPE_TABLE)
+
+# Event log rows; the live log and the history of past messages share this
+# format so a step looks the same before and after a rerun
+_ROW_TMPL = "**{title}**{details}{duration}"
+_DETAILS_TMPL = " - {details}"
+_DURATION_TMPL = " *({duration:.2f}s)*"
+
+
+def render_step_markdown(
+    title: str, details: str | None, duration: float | None
+) -> str:
+    """Render one event log row
+
+    Titles are built by the stream handlers, which escape the names interpolated
+    into them; details are escaped here. Running steps pass duration=None.
+    """
+    return _ROW_TMPL.format_map(
+        {
+            "title": title,
+            "details": (
+                _DETAILS_TMPL.format_map({"details": escape_markdown(details)})
+                if details
+                else ""
+            ),
+            "duration": (
+                _DURATION_TMPL.format_map({"duration": duration})
+                if duration is not None
+                else ""
+            ),
+        }
+    )
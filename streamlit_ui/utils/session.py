@@ -2,11 +2,17 @@
 Session management utilities for Streamlit DSA Agent
 """
 
-import uuid
+import asyncio
+import secrets
 from typing import Any, Dict
 
 import streamlit as st
 
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
+
 from utils.gen_userid import generate_user_id
 
 
@@ -19,15 +25,31 @@ def initialize_session_state():
         st.session_state.user_id = None  # Will be set when config is available
 
     if "session_id" not in st.session_state:
-        st.session_state.session_id = str(uuid.uuid4())
+        st.session_state.session_id = secrets.token_hex(16)
 
     if "agent" not in st.session_state:
         st.session_state.agent = None
 
+    if "_stats" not in st.session_state:
+        st.session_state._stats = _new_session_stats()
+
+    if "event_loop" not in st.session_state:
+        # Reused for every streamed response instead of asyncio.run per message;
+        # backed by uvloop when it is installed
+        st.session_state.event_loop = (
+            uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+        )
+
 
 def update_user_id(config: Dict[str, Any]):
     """Update user ID based on current configuration"""
-    new_user_id = generate_user_id(config)
+    # Called on every rerun with mostly unchanged inputs; the last derivation
+    # is cached in this session only, so credentials never outlive it
+    key = (config.get("lc_session", ""), config.get("gh_token", ""))
+    cached = st.session_state.get("_user_id_cache")
+    if cached is None or cached[0] != key:
+        cached = st.session_state["_user_id_cache"] = (key, generate_user_id(config))
+    new_user_id = cached[1]
 
     if st.session_state.user_id != new_user_id:
         st.session_state.user_id = new_user_id
@@ -35,9 +57,10 @@ def update_user_id(config: Dict[str, Any]):
 
 def reset_session():
     """Reset session state for a new conversation"""
-    st.session_state.session_id = str(uuid.uuid4())
+    st.session_state.session_id = secrets.token_hex(16)
     st.session_state.messages = []
     st.session_state.agent = None
+    st.session_state._stats = _new_session_stats()
 
 
 def clear_execution_status():
@@ -46,40 +69,61 @@ def clear_execution_status():
         if "execution_status" in message:
             del message["execution_status"]
 
+    # Statistics are derived from execution statuses, so only responses remain
+    st.session_state._stats = {
+        **_new_session_stats(),
+        "total_responses": st.session_state._stats["total_responses"],
+    }
 
-def get_session_statistics() -> Dict[str, Any]:
-    """Calculate and return session statistics"""
-    assistant_messages = [
-        msg for msg in st.session_state.messages if msg["role"] == "assistant"
-    ]
 
-    if not assistant_messages:
-        return {}
+def _new_session_stats() -> Dict[str, Any]:
+    """Return zeroed running totals for session statistics"""
+    return {
+        "total_responses": 0,
+        "total_tools": 0,
+        "total_events": 0,
+        "execution_time_sum": 0.0,
+        "execution_time_count": 0,
+    }
+
 
-    total_tools = 0
-    total_events = 0
-    valid_executions = []
+def add_assistant_message(content: str, execution_status: Dict[str, Any]):
+    """Append an assistant response and fold its status into the session totals"""
+    st.session_state.messages.append(
+        {
+            "role": "assistant",
+            "content": content,
+            "execution_status": execution_status,
+        }
+    )
 
-    for msg in assistant_messages:
-        if "execution_status" in msg:
-            exec_status = msg["execution_status"]
-            details = exec_status.get("details", {})
+    stats = st.session_state._stats
+    stats["total_responses"] += 1
+    stats["total_tools"] += len(execution_status.get("tools_used", []))
+    details = execution_status.get("details", {})
+    stats["total_events"] += details.get("total_events", 0)
+    exec_time = details.get("execution_time", 0)
+    if exec_time > 0:
+        stats["execution_time_sum"] += exec_time
+        stats["execution_time_count"] += 1
 
-            total_tools += len(exec_status.get("tools_used", []))
-            total_events += details.get("total_events", 0)
 
-            exec_time = details.get("execution_time", 0)
-            if exec_time > 0:
-                valid_executions.append(exec_time)
+def get_session_statistics() -> Dict[str, Any]:
+    """Return session statistics from the running totals"""
+    stats = st.session_state._stats
+    if not stats["total_responses"]:
+        return {}
 
     avg_execution_time = (
-        sum(valid_executions) / len(valid_executions) if valid_executions else 0
+        stats["execution_time_sum"] / stats["execution_time_count"]
+        if stats["execution_time_count"]
+        else 0
     )
 
     return {
         "total_messages": len(st.session_state.messages),
-        "total_responses": len(assistant_messages),
-        "total_tools": total_tools,
-        "total_events": total_events,
+        "total_responses": stats["total_responses"],
+        "total_tools": stats["total_tools"],
+        "total_events": stats["total_events"],
         "avg_execution_time": avg_execution_time,
     }
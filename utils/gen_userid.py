@@ -4,11 +4,12 @@ from typing import Any
 
 def generate_user_id(config: dict[str, Any]) -> str:
     """Generate a unique user ID based on user configurations"""
-    # Create a string from the configuration values
-    config_string = f"{config.get('lc_session', '')}-{config.get('gh_token', '')}"
-
-    # Create a hash of the configuration
-    config_hash = hashlib.md5(config_string.encode()).hexdigest()[:12]
+    # Hash "<lc_session>-<gh_token>"; the IDs key stored agent memories, so the
+    # MD5 derivation must stay stable across releases
+    config_hash = hashlib.md5(usedforsecurity=False)
+    config_hash.update(config.get("lc_session", "").encode())
+    config_hash.update(b"-")
+    config_hash.update(config.get("gh_token", "").encode())
 
     # Return a user-friendly ID
-    return f"user-{config_hash}"
+    return f"user-{config_hash.hexdigest()[:12]}"